@@ -20,7 +20,9 @@ config = context.config
 # Override sqlalchemy.url from environment
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL_SYNC)
 
-if config.config_file_name is not None:
+# Skip logging setup when the app runs migrations itself (init_db) so its
+# own logging configuration is left alone
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
@@ -41,6 +43,14 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Connection handed in by init_db at app startup
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
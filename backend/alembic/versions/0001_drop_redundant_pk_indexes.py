@@ -0,0 +1,37 @@
+"""drop redundant primary-key indexes
+
+Tables created by init_db() with ``index=True`` on ``id`` carry a second
+btree identical to the primary-key index. Drop it on every table.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 09:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = (
+    "users",
+    "rooms",
+    "room_participants",
+    "message_logs",
+    "subscription_plans",
+)
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_id")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.create_index(f"ix_{table}_id", table, ["id"])
@@ -0,0 +1,85 @@
+"""intern message audio URLs in audio_assets
+
+Moves ``message_logs.audio_url`` (VARCHAR(500) per row) into a deduplicated
+``audio_assets`` table referenced by ``message_logs.audio_asset_id``.
+
+Each step checks the live schema first: builds that ran only ``create_all``
+at startup may already have created ``audio_assets`` without touching the
+existing ``message_logs`` table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 09:30:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    message_columns = {c["name"] for c in inspector.get_columns("message_logs")}
+
+    if not inspector.has_table("audio_assets"):
+        op.create_table(
+            "audio_assets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("url", sa.String(500), nullable=False, unique=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+
+    if "audio_asset_id" not in message_columns:
+        op.add_column(
+            "message_logs",
+            sa.Column(
+                "audio_asset_id",
+                sa.Integer(),
+                sa.ForeignKey("audio_assets.id", ondelete="SET NULL"),
+                nullable=True,
+            ),
+        )
+
+    if "audio_url" not in message_columns:
+        return
+    op.execute(
+        """
+        INSERT INTO audio_assets (url)
+        SELECT DISTINCT audio_url FROM message_logs
+        WHERE audio_url IS NOT NULL AND audio_url <> ''
+        ON CONFLICT (url) DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        UPDATE message_logs m SET audio_asset_id = a.id
+        FROM audio_assets a WHERE a.url = m.audio_url
+        """
+    )
+    op.drop_column("message_logs", "audio_url")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "message_logs",
+        sa.Column("audio_url", sa.String(500), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE message_logs m SET audio_url = a.url
+        FROM audio_assets a WHERE a.id = m.audio_asset_id
+        """
+    )
+    op.drop_column("message_logs", "audio_asset_id")
+    op.drop_table("audio_assets")
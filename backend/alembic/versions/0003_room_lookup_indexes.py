@@ -0,0 +1,37 @@
+"""composite indexes for active room / participant lookups
+
+``rooms(room_code, status)`` serves the active-room-by-code lookups on WS
+accept and join; ``room_participants(room_id, is_active)`` serves the
+active participant counts. Both are created IF NOT EXISTS because a
+database first built by ``create_all`` from newer models already has them.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 10:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_rooms_code_status", "rooms", ["room_code", "status"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_rp_room_active", "room_participants", ["room_id", "is_active"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rp_room_active", table_name="room_participants")
+    op.drop_index("ix_rooms_code_status", table_name="rooms")
@@ -0,0 +1,44 @@
+"""database-side now() defaults on timestamp columns
+
+The models fill ``created_at`` / ``updated_at`` / ``joined_at`` with
+``server_default=func.now()`` and no longer send a value on INSERT, so
+tables created before that change need the column default set or every
+insert fails the NOT NULL constraint.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 11:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns that used a Python-side default before this revision
+_TIMESTAMP_COLUMNS = (
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("rooms", "created_at"),
+    ("room_participants", "joined_at"),
+    ("message_logs", "created_at"),
+    ("subscription_plans", "created_at"),
+)
+
+
+def upgrade() -> None:
+    for table, column in _TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("now()"))
+    # 0002 already creates audio_assets.created_at with this default; set it
+    # anyway so every timestamp column ends up in the same state.
+    op.alter_column("audio_assets", "created_at", server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    for table, column in reversed(_TIMESTAMP_COLUMNS):
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,61 @@
+"""case-insensitive unique indexes on users.username / users.email
+
+Replaces the plain unique indexes with unique indexes on ``lower(col)``,
+which registration's ``ON CONFLICT DO NOTHING`` and the login lookup rely
+on. Existing rows that differ only by case would violate the new indexes,
+so the upgrade refuses to run until they are resolved by hand.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 11:30:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ("username", "email")
+
+
+def _case_duplicates(column: str) -> list:
+    return op.get_bind().execute(
+        sa.text(
+            f"SELECT lower({column}) FROM users "
+            f"GROUP BY lower({column}) HAVING count(*) > 1 ORDER BY 1"
+        )
+    ).scalars().all()
+
+
+def upgrade() -> None:
+    problems = []
+    for column in _COLUMNS:
+        duplicates = _case_duplicates(column)
+        if duplicates:
+            problems.append(f"{column}: {', '.join(duplicates)}")
+    if problems:
+        raise RuntimeError(
+            "Cannot create case-insensitive unique indexes on users; rename or "
+            "merge these accounts first — " + "; ".join(problems)
+        )
+
+    for column in _COLUMNS:
+        op.create_index(
+            f"ix_users_{column}_lower",
+            "users",
+            [sa.text(f"lower({column})")],
+            unique=True,
+            if_not_exists=True,
+        )
+        op.execute(f"DROP INDEX IF EXISTS ix_users_{column}")
+
+
+def downgrade() -> None:
+    for column in _COLUMNS:
+        op.create_index(f"ix_users_{column}", "users", [column], unique=True)
+        op.drop_index(f"ix_users_{column}_lower", table_name="users")
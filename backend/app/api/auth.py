@@ -1,19 +1,42 @@
 """
-Authentication API routes — register, login, get current user.
+Authentication API routes — register, login, logout, get current user.
 """
 
+import time
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db.session import get_db
 from app.db.models import User
 from app.schemas.auth import UserRegister, UserLogin, Token, UserResponse
-from app.core.security import hash_password, verify_password, create_access_token
-from app.core.dependencies import get_current_user
+from app.core.security import (
+    hash_password,
+    verify_password,
+    password_needs_rehash,
+    create_access_token,
+    decode_access_token,
+)
+from app.core.cache import cache_delete, cache_set
+from app.core.dependencies import (
+    get_current_user_full,
+    oauth2_scheme,
+    revocation_key,
+    user_cache_key,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
+# Hot statement — built and cache-keyed once per process
+_user_by_username = lambda_stmt(
+    lambda: select(User).where(
+        func.lower(User.username) == func.lower(bindparam("username"))
+    )
+)
+
 
 # --------------------------------------------------------------------------
 # Register
@@ -21,29 +44,30 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user account."""
-    # Check for duplicate username
-    existing = await db.execute(
-        select(User).where(
-            (User.username == payload.username) | (User.email == payload.email)
+    # Hash up-front so rejected duplicates pay the same cost (timing-safe)
+    hashed = await hash_password(payload.password)
+
+    # Single round-trip: the case-insensitive unique indexes on username /
+    # email act as the duplicate check; no row comes back on a collision.
+    result = await db.execute(
+        pg_insert(User)
+        .values(
+            username=payload.username,
+            email=payload.email,
+            hashed_password=hashed,
+            full_name=payload.full_name,
+            preferred_language=payload.preferred_language,
         )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
-    if existing.scalar_one_or_none():
+    user = result.scalar_one_or_none()
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username or email already registered",
         )
 
-    user = User(
-        username=payload.username,
-        email=payload.email,
-        hashed_password=hash_password(payload.password),
-        full_name=payload.full_name,
-        preferred_language=payload.preferred_language,
-    )
-    db.add(user)
-    await db.flush()
-    await db.refresh(user)
-
     return user
 
 
@@ -53,12 +77,10 @@ async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate and return JWT token."""
-    result = await db.execute(
-        select(User).where(User.username == payload.username)
-    )
+    result = await db.execute(_user_by_username, {"username": payload.username})
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(payload.password, user.hashed_password):
+    if user is None or not await verify_password(payload.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
@@ -71,6 +93,10 @@ async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="User account is deactivated",
         )
 
+    # Transparently upgrade legacy bcrypt / weaker Argon2 hashes
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password(payload.password)
+
     access_token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=access_token)
 
@@ -78,7 +104,30 @@ async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
 # --------------------------------------------------------------------------
 # Current User
 # --------------------------------------------------------------------------
-@router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+@router.get(
+    "/me",
+    response_model=None,
+    responses={200: {"model": UserResponse}},
+)
+async def get_me(current_user: User = Depends(get_current_user_full)):
     """Get the currently authenticated user."""
-    return current_user
+    return ORJSONResponse(UserResponse.model_validate(current_user).model_dump())
+
+
+# --------------------------------------------------------------------------
+# Logout
+# --------------------------------------------------------------------------
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme)):
+    """
+    Revoke this token until it expires and drop its cached user.
+
+    Revocations live in Redis; without REDIS_URL the token stays valid
+    until it expires and the client just discards it.
+    """
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return
+    ttl = int(payload.get("exp", 0) - time.time())
+    await cache_set(revocation_key(payload), "1", ttl)
+    await cache_delete(user_cache_key(payload))
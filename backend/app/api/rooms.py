@@ -2,24 +2,28 @@
 Meeting room API routes — create, list, join, detail, leave, end.
 """
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.session import get_db
-from app.db.models import User, RoomStatus
 from app.schemas.room import (
     RoomCreate,
     RoomJoin,
     RoomResponse,
     RoomDetailResponse,
-    ParticipantInfo,
 )
-from app.core.dependencies import get_current_user
+from app.core.dependencies import CurrentUser, get_current_user
 from app.services.room_service import (
     create_room,
     join_room,
     get_room_by_code,
+    get_room_detail_by_code,
     get_user_rooms,
+    get_active_participant_counts,
+    stream_user_rooms,
     leave_room,
     end_room,
 )
@@ -27,58 +31,71 @@ from app.services.room_service import (
 router = APIRouter(prefix="/api/rooms", tags=["Rooms"])
 
 
+async def _iter_room_list_json(user_id: int):
+    """Yield the user's room list as a JSON array, one room at a time."""
+    yield b"["
+    first = True
+    async for room, active_count in stream_user_rooms(user_id):
+        response = RoomResponse.model_validate(room)
+        response.participant_count = active_count
+        if not first:
+            yield b","
+        first = False
+        yield orjson.dumps(response.model_dump())
+    yield b"]"
+
+
 # --------------------------------------------------------------------------
 # Create Room
 # --------------------------------------------------------------------------
 @router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_room(
     payload: RoomCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new meeting room."""
     room = await create_room(
         db=db,
-        owner=current_user,
+        owner_id=current_user.id,
         name=payload.name,
         max_participants=payload.max_participants,
     )
-    return RoomResponse(
-        id=room.id,
-        room_code=room.room_code,
-        name=room.name,
-        owner_id=room.owner_id,
-        status=room.status.value,
-        max_participants=room.max_participants,
-        created_at=room.created_at,
-        participant_count=1,
-    )
+    response = RoomResponse.model_validate(room)
+    response.participant_count = 1
+    return response
 
 
 # --------------------------------------------------------------------------
 # List Rooms
 # --------------------------------------------------------------------------
-@router.get("/", response_model=list[RoomResponse])
+# Hot read path: validated once here and serialized by orjson, skipping
+# FastAPI's second response_model pass (the schema stays in the docs).
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": list[RoomResponse]}},
+)
 async def list_rooms(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """List all rooms the current user is part of."""
-    rooms = await get_user_rooms(db, current_user.id)
-    return [
-        RoomResponse(
-            id=r.id,
-            room_code=r.room_code,
-            name=r.name,
-            owner_id=r.owner_id,
-            status=r.status.value if isinstance(r.status, RoomStatus) else r.status,
-            max_participants=r.max_participants,
-            created_at=r.created_at,
-            ended_at=r.ended_at,
-            participant_count=0,
+    threshold = settings.ROOM_LIST_STREAM_THRESHOLD
+    rooms = await get_user_rooms(db, current_user.id, limit=threshold + 1)
+    if len(rooms) > threshold:
+        # Large lists are streamed over a server-side cursor to bound memory
+        return StreamingResponse(
+            _iter_room_list_json(current_user.id), media_type="application/json"
         )
-        for r in rooms
-    ]
+
+    counts = await get_active_participant_counts(db, [r.id for r in rooms])
+    content = []
+    for r in rooms:
+        response = RoomResponse.model_validate(r)
+        response.participant_count = counts.get(r.id, 0)
+        content.append(response.model_dump())
+    return ORJSONResponse(content)
 
 
 # --------------------------------------------------------------------------
@@ -87,13 +104,13 @@ async def list_rooms(
 @router.post("/join", response_model=RoomResponse)
 async def join_existing_room(
     payload: RoomJoin,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Join an existing meeting room by room code."""
     room = await join_room(
         db=db,
-        user=current_user,
+        user_id=current_user.id,
         room_code=payload.room_code,
         language_mode=payload.language_mode,
     )
@@ -102,57 +119,34 @@ async def join_existing_room(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found, is full, or has ended",
         )
-    return RoomResponse(
-        id=room.id,
-        room_code=room.room_code,
-        name=room.name,
-        owner_id=room.owner_id,
-        status=room.status.value if isinstance(room.status, RoomStatus) else room.status,
-        max_participants=room.max_participants,
-        created_at=room.created_at,
-        participant_count=0,
-    )
+    return RoomResponse.model_validate(room)
 
 
 # --------------------------------------------------------------------------
 # Room Detail
 # --------------------------------------------------------------------------
-@router.get("/{room_code}", response_model=RoomDetailResponse)
+@router.get(
+    "/{room_code}",
+    response_model=None,
+    responses={200: {"model": RoomDetailResponse}},
+)
 async def get_room_detail(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get room detail with participants."""
-    room = await get_room_by_code(db, room_code)
-    if room is None:
+    detail = await get_room_detail_by_code(db, room_code)
+    if detail is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found",
         )
+    room, active_count = detail
 
-    participants = [
-        ParticipantInfo(
-            user_id=p.user_id,
-            username=p.user.username if p.user else "Unknown",
-            language_mode=p.language_mode.value if hasattr(p.language_mode, 'value') else p.language_mode,
-            is_active=p.is_active,
-        )
-        for p in room.participants
-    ]
-
-    return RoomDetailResponse(
-        id=room.id,
-        room_code=room.room_code,
-        name=room.name,
-        owner_id=room.owner_id,
-        status=room.status.value if isinstance(room.status, RoomStatus) else room.status,
-        max_participants=room.max_participants,
-        created_at=room.created_at,
-        ended_at=room.ended_at,
-        participant_count=len([p for p in participants if p.is_active]),
-        participants=participants,
-    )
+    response = RoomDetailResponse.model_validate(room)
+    response.participant_count = active_count
+    return ORJSONResponse(response.model_dump())
 
 
 # --------------------------------------------------------------------------
@@ -161,7 +155,7 @@ async def get_room_detail(
 @router.post("/{room_code}/leave", status_code=status.HTTP_200_OK)
 async def leave_existing_room(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Leave a meeting room."""
@@ -180,7 +174,7 @@ async def leave_existing_room(
 @router.post("/{room_code}/end", status_code=status.HTTP_200_OK)
 async def end_existing_room(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """End a meeting room (owner only)."""
@@ -0,0 +1,32 @@
+"""
+TTS audio route — serves synthesized clips from memory, else from disk.
+"""
+
+import os
+
+from fastapi import APIRouter, HTTPException, Path, Response, status
+from fastapi.responses import FileResponse
+
+from app.services.tts import audio_path, get_cached_audio
+
+router = APIRouter(prefix="/tts", tags=["TTS"])
+
+
+@router.get("/{key}", response_class=Response)
+async def get_tts_audio(key: str = Path(..., pattern=r"^[0-9a-f]{32}$")):
+    """Return a synthesized MP3 clip by its content key."""
+    # Content-addressed: the bytes behind a key never change
+    headers = {"Cache-Control": "public, max-age=86400, immutable"}
+
+    audio = get_cached_audio(key)
+    if audio is not None:
+        return Response(content=audio, media_type="audio/mpeg", headers=headers)
+
+    path = audio_path(key)
+    if os.path.isfile(path):
+        return FileResponse(path, media_type="audio/mpeg", headers=headers)
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Audio not found",
+    )
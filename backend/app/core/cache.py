@@ -0,0 +1,89 @@
+"""
+Shared Redis client used for cross-worker caches.
+
+Caching is optional: when REDIS_URL is empty every helper degrades to a
+cache miss and callers fall back to the database / upstream API.
+"""
+
+import logging
+from typing import List, Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis is only a cache: fail fast to a miss rather than stall auth or
+# translation on the OS TCP timeout when the server is unreachable
+_SOCKET_TIMEOUT_S = 0.25
+
+# Global client reference — created lazily once per process
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """Return the shared Redis client, or None if caching is disabled."""
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        _redis = Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=_SOCKET_TIMEOUT_S,
+            socket_timeout=_SOCKET_TIMEOUT_S,
+        )
+    return _redis
+
+
+async def cache_get(key: str) -> Optional[str]:
+    """GET a key, treating any Redis error as a miss."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        return await redis.get(key)
+    except Exception as exc:
+        logger.warning("Redis GET failed for %s: %s", key, exc)
+        return None
+
+
+async def cache_get_many(*keys: str) -> List[Optional[str]]:
+    """MGET several keys in one round-trip, treating any Redis error as misses."""
+    redis = get_redis()
+    if redis is None:
+        return [None] * len(keys)
+    try:
+        return await redis.mget(keys)
+    except Exception as exc:
+        logger.warning("Redis MGET failed for %s: %s", keys, exc)
+        return [None] * len(keys)
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    """SET a key with an expiry in seconds, ignoring Redis errors."""
+    redis = get_redis()
+    if redis is None or ttl <= 0:
+        return
+    try:
+        await redis.set(key, value, ex=ttl)
+    except Exception as exc:
+        logger.warning("Redis SET failed for %s: %s", key, exc)
+
+
+async def cache_delete(key: str) -> None:
+    """DELETE a key, ignoring Redis errors."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(key)
+    except Exception as exc:
+        logger.warning("Redis DELETE failed for %s: %s", key, exc)
+
+
+async def close_redis() -> None:
+    """Close the shared client on shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
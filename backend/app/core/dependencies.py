@@ -2,47 +2,119 @@
 FastAPI dependency injection helpers.
 """
 
+import json
+import time
+from collections import namedtuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, lambda_stmt, select
 
+from app.core.cache import cache_get, cache_get_many, cache_set
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.db.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Lightweight identity for endpoints that only need the user's id
+CurrentUser = namedtuple("CurrentUser", "id is_active")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Validate JWT token and return the current user."""
-    credentials_exception = HTTPException(
+# Hot statements — built and cache-keyed once per process
+_identity_by_id = lambda_stmt(
+    lambda: select(User.id, User.is_active).where(User.id == bindparam("user_id"))
+)
+_user_by_id = lambda_stmt(
+    lambda: select(User).where(User.id == bindparam("user_id"))
+)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _inactive_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="User account is deactivated",
+    )
+
+
+def user_cache_key(payload: dict) -> str:
+    """Cache key for a verified token payload (scoped to the token's iat)."""
+    return f"auth:{payload.get('sub')}:{payload.get('iat', 0)}"
+
+
+def revocation_key(payload: dict) -> str:
+    """Key marking a token (by subject and iat) as logged out."""
+    return f"revoked:{payload.get('sub')}:{payload.get('iat', 0)}"
+
+
+async def is_token_revoked(payload: dict) -> bool:
+    """True if the token was revoked by /logout (always False without Redis)."""
+    return await cache_get(revocation_key(payload)) is not None
+
+
+def _decode_token(token: str) -> dict:
+    """Decode the bearer token, raising 401 if it is invalid or has no subject."""
     payload = decode_access_token(token)
-    if payload is None:
-        raise credentials_exception
+    if payload is None or payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
+    """Validate JWT token and return the current user's id / active flag."""
+    payload = _decode_token(token)
+
+    # Cache hit — no DB trip; the revocation check rides the same round-trip
+    cache_key = user_cache_key(payload)
+    cached, revoked = await cache_get_many(cache_key, revocation_key(payload))
+    if revoked is not None:
+        raise _credentials_exception()
+    if cached is not None:
+        user = CurrentUser(*json.loads(cached))
+    else:
+        result = await db.execute(_identity_by_id, {"user_id": int(payload["sub"])})
+        row = result.one_or_none()
+        if row is None:
+            raise _credentials_exception()
+        user = CurrentUser(*row)
+
+        ttl = min(settings.AUTH_CACHE_TTL_SECONDS, int(payload["exp"] - time.time()))
+        await cache_set(cache_key, json.dumps(user), ttl)
 
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
+    if not user.is_active:
+        raise _inactive_exception()
+
+    return user
+
+
+async def get_current_user_full(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Validate JWT token and return the full User row (e.g. for /me)."""
+    payload = _decode_token(token)
+    if await is_token_revoked(payload):
+        raise _credentials_exception()
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
+    result = await db.execute(_user_by_id, {"user_id": int(payload["sub"])})
     user = result.scalar_one_or_none()
 
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is deactivated",
-        )
+        raise _inactive_exception()
 
     return user
@@ -2,7 +2,12 @@
 JWT token creation and password hashing utilities.
 """
 
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 from jose import JWTError, jwt
@@ -10,36 +15,75 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Argon2id with OWASP-recommended parameters (19 MiB, 2 passes, 1 lane).
+# bcrypt stays verifiable so existing hashes are upgraded on next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
 
+# Resolved once — avoids settings lookups and list allocation per decode
+_SECRET_KEY = settings.SECRET_KEY
+_ALGORITHMS = [settings.ALGORITHM]
 
-def hash_password(password: str) -> str:
+# KDF work is CPU-bound — keep it off the event loop, one worker per core
+_hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="pwhash"
+)
+
+
+async def hash_password(password: str) -> str:
     """Hash a plaintext password."""
-    return pwd_context.hash(password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify, plain_password, hashed_password
+    )
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash uses a deprecated scheme or outdated parameters."""
+    return pwd_context.needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
+    now = datetime.now(timezone.utc)
+    expire = now + (
         expires_delta
         or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.update({"exp": expire, "iat": now})
+    return jwt.encode(to_encode, _SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and validate a JWT access token. Returns payload or None."""
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str, minute_bucket: int) -> Optional[dict]:
+    """Verify a token once per minute bucket; clients reuse tokens heavily."""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        return jwt.decode(token, _SECRET_KEY, algorithms=_ALGORITHMS)
     except JWTError:
         return None
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """Decode and validate a JWT access token. Returns payload or None.
+
+    The returned dict is shared with the decode cache — do not mutate it.
+    """
+    now = time.time()
+    payload = _decode_cached(token, int(now // 60))
+    # Re-check expiry: a cached payload may have expired within its bucket
+    if payload is None or payload.get("exp", 0) <= now:
+        return None
+    return payload
@@ -6,10 +6,10 @@ Models:
   - Room:             Meeting rooms
   - RoomParticipant:  Users in a room
   - MessageLog:       Transcription / translation log
+  - AudioAsset:       Deduplicated TTS audio URLs
   - SubscriptionPlan: Billing plans (admin-ready)
 """
 
-from datetime import datetime, timezone
 from sqlalchemy import (
     Column,
     Integer,
@@ -20,7 +20,9 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Enum as SAEnum,
+    Index,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy.orm import relationship
 import enum
@@ -53,9 +55,9 @@ class PlanTier(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(80), unique=True, nullable=False, index=True)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    username = Column(String(80), nullable=False)
+    email = Column(String(255), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(150), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
@@ -64,22 +66,27 @@ class User(Base):
     plan_id = Column(Integer, ForeignKey("subscription_plans.id"), nullable=True)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
 
     # Relationships
-    owned_rooms = relationship("Room", back_populates="owner", lazy="selectin")
-    participations = relationship(
-        "RoomParticipant", back_populates="user", lazy="selectin"
+    # Default lazy loading — callers opt in with loader options where needed
+    owned_rooms = relationship("Room", back_populates="owner")
+    participations = relationship("RoomParticipant", back_populates="user")
+    plan = relationship("SubscriptionPlan", back_populates="users")
+
+    # Case-insensitive uniqueness; also serves lower(username) lookups at login
+    __table_args__ = (
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+        Index("ix_users_email_lower", func.lower(email), unique=True),
     )
-    plan = relationship("SubscriptionPlan", back_populates="users", lazy="selectin")
 
     def __repr__(self):
         return f"<User id={self.id} username={self.username}>"
@@ -91,7 +98,7 @@ class User(Base):
 class Room(Base):
     __tablename__ = "rooms"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     room_code = Column(String(20), unique=True, nullable=False, index=True)
     name = Column(String(200), nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -101,17 +108,21 @@ class Room(Base):
     max_participants = Column(Integer, default=10, nullable=False)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     ended_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    owner = relationship("User", back_populates="owned_rooms", lazy="selectin")
-    participants = relationship(
-        "RoomParticipant", back_populates="room", lazy="selectin"
+    owner = relationship("User", back_populates="owned_rooms")
+    participants = relationship("RoomParticipant", back_populates="room")
+    messages = relationship("MessageLog", back_populates="room")
+
+    # Active-room lookups by code (WS accept, join) test status in the index
+    # before touching the heap; room_code alone is already unique-indexed
+    __table_args__ = (
+        Index("ix_rooms_code_status", "room_code", "status"),
     )
-    messages = relationship("MessageLog", back_populates="room", lazy="selectin")
 
     def __repr__(self):
         return f"<Room id={self.id} code={self.room_code}>"
@@ -124,9 +135,11 @@ class RoomParticipant(Base):
     __tablename__ = "room_participants"
     __table_args__ = (
         UniqueConstraint("room_id", "user_id", name="uq_room_user"),
+        # Active participant counts per room
+        Index("ix_rp_room_active", "room_id", "is_active"),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     language_mode = Column(
@@ -136,7 +149,7 @@ class RoomParticipant(Base):
     )
     joined_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     is_active = Column(Boolean, default=True, nullable=False)
@@ -152,23 +165,44 @@ class RoomParticipant(Base):
 class MessageLog(Base):
     __tablename__ = "message_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     original_text = Column(Text, nullable=False)
     translated_text = Column(Text, nullable=False)
     source_language = Column(String(10), nullable=False)
     target_language = Column(String(10), nullable=False)
-    audio_url = Column(String(500), nullable=True)
+    audio_asset_id = Column(
+        Integer, ForeignKey("audio_assets.id", ondelete="SET NULL"), nullable=True
+    )
     confidence = Column(Float, nullable=True)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
     # Relationships
     room = relationship("Room", back_populates="messages")
+    audio_asset = relationship("AudioAsset")
+
+
+# ---------------------------------------------------------------------------
+# Audio Asset (interned TTS URLs — repeated phrases share one row)
+# ---------------------------------------------------------------------------
+class AudioAsset(Base):
+    __tablename__ = "audio_assets"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), unique=True, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<AudioAsset id={self.id} url={self.url}>"
 
 
 # ---------------------------------------------------------------------------
@@ -177,7 +211,7 @@ class MessageLog(Base):
 class SubscriptionPlan(Base):
     __tablename__ = "subscription_plans"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, nullable=False)
     tier = Column(SAEnum(PlanTier), default=PlanTier.FREE, nullable=False)
     max_rooms = Column(Integer, default=3, nullable=False)
@@ -187,12 +221,12 @@ class SubscriptionPlan(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
     # Relationships
-    users = relationship("User", back_populates="plan", lazy="selectin")
+    users = relationship("User", back_populates="plan")
 
     def __repr__(self):
         return f"<SubscriptionPlan id={self.id} name={self.name}>"
@@ -2,18 +2,31 @@
 Async SQLAlchemy session factory and engine configuration.
 """
 
+import os
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.core.config import settings
 
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    pool_size=20,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
     pool_recycle=3600,
+    connect_args={
+        # asyncpg server-side statement cache / SQLAlchemy's prepared cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # JIT compile time dwarfs the cost of our small OLTP queries
+        "server_settings": {"jit": "off"},
+    },
 )
 
 async_session_factory = async_sessionmaker(
@@ -28,20 +41,126 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db():
-    """FastAPI dependency that yields an async database session."""
-    async with async_session_factory() as session:
+# ---------------------------------------------------------------------------
+# Write tracking — lets DBSessionMiddleware skip COMMIT for read-only requests
+# ---------------------------------------------------------------------------
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_writes(orm_execute_state):
+    # SELECTs wrapping data-modifying CTEs opt in via has_writes=True
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.execution_options.get("has_writes")
+    ):
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def _has_pending_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get("has_writes")
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+# ---------------------------------------------------------------------------
+# Request-scoped session
+# ---------------------------------------------------------------------------
+_db_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "db_session", default=None
+)
+
+
+class DBSessionMiddleware:
+    """
+    Pure ASGI middleware that opens one AsyncSession per API request.
+
+    The session is shared with every dependency through a ContextVar, and
+    the transaction is settled once, just before the response starts:
+    committed if the request wrote something and succeeded, otherwise left
+    to be rolled back when the connection returns to the pool.
+    """
+
+    def __init__(self, app, path_prefix: str = "/api"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        session = async_session_factory()
+        token = _db_session.set(session)
+
+        async def send_with_commit(message):
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+                and _has_pending_writes(session)
+            ):
+                await session.commit()
+            await send(message)
+
         try:
-            yield session
-            await session.commit()
+            await self.app(scope, receive, send_with_commit)
         except Exception:
             await session.rollback()
             raise
         finally:
+            _db_session.reset(token)
             await session.close()
 
 
+async def get_db() -> AsyncSession:
+    """FastAPI dependency returning the current request's session."""
+    session = _db_session.get()
+    if session is None:
+        raise RuntimeError("get_db() used outside DBSessionMiddleware")
+    return session
+
+
+# ---------------------------------------------------------------------------
+# Schema setup
+# ---------------------------------------------------------------------------
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pg_advisory_xact_lock key serializing schema setup across worker processes
+_SCHEMA_LOCK_KEY = 0x5F5C4E01
+
+
+def _upgrade_schema(connection) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(_BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(_BACKEND_DIR, "alembic"))
+    config.attributes["connection"] = connection
+
+    # Held until init_db's transaction commits: other workers wait here,
+    # then find the schema already at head and do nothing
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _SCHEMA_LOCK_KEY})
+
+    if inspect(connection).has_table("users"):
+        command.upgrade(config, "head")
+    else:
+        Base.metadata.create_all(connection)
+        command.stamp(config, "head")
+
+
 async def init_db():
-    """Create all tables (use Alembic in production instead)."""
+    """
+    Bring the database schema up to date (app startup).
+
+    An empty database is built from the models and stamped at the Alembic
+    head; an existing one is upgraded through the migration chain, so tables
+    created by earlier releases pick up new columns, defaults and indexes.
+    Concurrent workers serialize on a Postgres advisory lock.
+    """
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
@@ -2,6 +2,7 @@
 Live AI Meeting Interpreter — FastAPI Application Entry Point.
 
 Bootstraps the application with:
+  - Request-scoped DB session middleware
   - CORS middleware
   - Static file serving
   - API route registration
@@ -15,12 +16,17 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
-from app.db.session import init_db
+from app.core.cache import close_redis
+from app.db.session import DBSessionMiddleware, init_db
+from app.services.message_log import start_message_writer, stop_message_writer
+from app.services.tts import start_tts_janitor, stop_tts_janitor
 from app.api.auth import router as auth_router
 from app.api.rooms import router as rooms_router
+from app.api.tts import router as tts_router
 from app.websocket.handler import router as ws_router
 
 # ---------------------------------------------------------------------------
@@ -49,8 +55,13 @@ async def lifespan(app: FastAPI):
     logger.info("✅ Database tables ensured.")
     settings.ensure_directories()
     logger.info("✅ Static directories ready.")
+    start_message_writer()
+    start_tts_janitor()
     yield
     logger.info("🛑 Shutting down …")
+    await stop_tts_janitor()
+    await stop_message_writer()
+    await close_redis()
 
 
 # ---------------------------------------------------------------------------
@@ -61,19 +72,23 @@ app = FastAPI(
     description="Real-time Hindi ↔ English meeting interpreter with voice output",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 # ---------------------------------------------------------------------------
-# Middleware
+# Middleware (last added runs first — CORS answers preflights before any
+# DB session is opened)
 # ---------------------------------------------------------------------------
+app.add_middleware(DBSessionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette skip its wildcard handling per request
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "ngrok-skip-browser-warning"],
 )
 
 # ---------------------------------------------------------------------------
@@ -86,6 +101,7 @@ app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
 # ---------------------------------------------------------------------------
 app.include_router(auth_router)
 app.include_router(rooms_router)
+app.include_router(tts_router)
 app.include_router(ws_router)
 
 
@@ -96,10 +112,17 @@ app.include_router(ws_router)
 async def health_check():
     """Health check endpoint for load balancers and Docker."""
     from app.websocket.manager import manager
+    from app.db.session import engine
 
     return {
         "status": "healthy",
         "service": "Live AI Meeting Interpreter",
         "active_rooms": manager.get_room_count(),
         "active_connections": manager.get_total_connections(),
+        "db_pool": {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+            "status": engine.pool.status(),
+        },
     }
@@ -2,9 +2,11 @@
 Pydantic request / response schemas for meeting rooms.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Optional, List
+
+from app.db.models import LanguageMode, RoomStatus
 
 
 # ---------------------------------------------------------------------------
@@ -21,11 +23,23 @@ class RoomCreate(BaseModel):
 class ParticipantInfo(BaseModel):
     user_id: int
     username: str
-    language_mode: str
+    language_mode: LanguageMode
     is_active: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_participant(cls, data: Any) -> Any:
+        """Flatten a RoomParticipant row (username lives on the related user)."""
+        if isinstance(data, dict):
+            return data
+        return {
+            "user_id": data.user_id,
+            "username": data.user.username if data.user else "Unknown",
+            "language_mode": data.language_mode,
+            "is_active": data.is_active,
+        }
 
 
 class RoomResponse(BaseModel):
@@ -33,14 +47,13 @@ class RoomResponse(BaseModel):
     room_code: str
     name: str
     owner_id: int
-    status: str
+    status: RoomStatus
     max_participants: int
     created_at: datetime
     ended_at: Optional[datetime] = None
     participant_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 class RoomDetailResponse(RoomResponse):
@@ -68,5 +81,4 @@ class MessageResponse(BaseModel):
     confidence: Optional[float] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,161 @@
+"""
+Buffered MessageLog writer.
+
+Utterances are queued in memory and a background task flushes them every
+_FLUSH_INTERVAL_S (or as soon as _FLUSH_MAX_ROWS are waiting) with one
+audio-asset upsert, one multi-row INSERT and a single COMMIT, instead of a
+transaction per utterance. If a batch fails it is retried row by row, so
+only the offending rows are lost. Rows still queued at shutdown are drained.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.models import AudioAsset, MessageLog
+from app.db.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_INTERVAL_S = 0.5
+_FLUSH_MAX_ROWS = 100
+
+_STOP = object()  # sentinel: flush what's buffered and exit
+
+_queue: Optional[asyncio.Queue] = None
+_flusher: Optional[asyncio.Task] = None
+
+
+async def _upsert_audio_assets(db, urls: List[str]) -> Dict[str, int]:
+    """Upsert distinct audio URLs into audio_assets and map url → id."""
+    if not urls:
+        return {}
+    stmt = pg_insert(AudioAsset).values([{"url": url} for url in urls])
+    # DO UPDATE (a no-op) rather than DO NOTHING so RETURNING yields every id
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AudioAsset.url], set_={"url": stmt.excluded.url}
+        ).returning(AudioAsset.url, AudioAsset.id)
+    )
+    return dict(result.all())
+
+
+async def _insert_rows(batch: List[dict]) -> None:
+    """Insert buffered messages in one transaction."""
+    async with async_session_factory() as db:
+        asset_ids = await _upsert_audio_assets(
+            db, sorted({row["audio_url"] for row in batch if row["audio_url"]})
+        )
+        rows = []
+        for row in batch:
+            row = dict(row)
+            audio_url = row.pop("audio_url")
+            row["audio_asset_id"] = asset_ids.get(audio_url)
+            rows.append(row)
+        await db.execute(insert(MessageLog), rows)
+        await db.commit()
+
+
+async def _write_batch(batch: List[dict]) -> None:
+    """
+    Write a batch in one transaction; if that fails, retry row by row so
+    one bad row (e.g. a room deleted meanwhile) doesn't take the rest down.
+    """
+    try:
+        await _insert_rows(batch)
+        return
+    except Exception as exc:
+        if len(batch) == 1:
+            logger.exception(
+                "Failed to save message for room %d: %s", batch[0]["room_id"], exc
+            )
+            return
+        logger.warning(
+            "Batch insert of %d message(s) failed, retrying one by one: %s",
+            len(batch),
+            exc,
+        )
+
+    lost: Dict[int, int] = {}
+    for row in batch:
+        try:
+            await _insert_rows([row])
+        except Exception as exc:
+            lost[row["room_id"]] = lost.get(row["room_id"], 0) + 1
+            logger.warning("Dropping message for room %d: %s", row["room_id"], exc)
+    for room_id, count in lost.items():
+        logger.error("Lost %d message(s) for room %d", count, room_id)
+
+
+async def _flush_loop() -> None:
+    """Collect queued rows for up to _FLUSH_INTERVAL_S and write them."""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await _queue.get()
+        if item is _STOP:
+            break
+        batch = [item]
+        deadline = loop.time() + _FLUSH_INTERVAL_S
+        while len(batch) < _FLUSH_MAX_ROWS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+        await _write_batch(batch)
+
+
+def start_message_writer() -> None:
+    """Start the background flusher on the running loop (app startup)."""
+    global _queue, _flusher
+    if _flusher is None or _flusher.done():
+        _queue = asyncio.Queue()
+        _flusher = asyncio.create_task(_flush_loop())
+
+
+async def stop_message_writer() -> None:
+    """Flush everything still buffered and stop the flusher (app shutdown)."""
+    global _flusher
+    if _flusher is None:
+        return
+    await _queue.put(_STOP)
+    await _flusher
+    _flusher = None
+
+
+def save_message(
+    room_id: int,
+    user_id: int,
+    original_text: str,
+    translated_text: str,
+    source_lang: str,
+    target_lang: str,
+    audio_url: str,
+    confidence: float,
+) -> None:
+    """Queue a message log entry for the next batched flush."""
+    if _queue is None:
+        logger.warning("Message writer not started; dropping message for room %d", room_id)
+        return
+    _queue.put_nowait(
+        {
+            "room_id": room_id,
+            "user_id": user_id,
+            "original_text": original_text,
+            "translated_text": translated_text,
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "audio_url": audio_url,
+            "confidence": confidence,
+        }
+    )
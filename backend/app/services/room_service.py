@@ -4,155 +4,270 @@ Room management service.
 Handles room creation, joining, lookup, and participant management.
 """
 
+import base64
 import logging
 import secrets
-import string
-from typing import Optional, List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import select, func
+from sqlalchemy import (
+    and_,
+    bindparam,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.models import Room, RoomParticipant, RoomStatus, LanguageMode, User
+from app.db.models import Room, RoomParticipant, RoomStatus, LanguageMode
+from app.db.session import async_session_factory
 
 logger = logging.getLogger(__name__)
 
+_ROOM_CODE_ATTEMPTS = 5
+
+# Hot statements — built and cache-keyed once per process
+_room_by_code = lambda_stmt(
+    lambda: select(Room).where(Room.room_code == bindparam("room_code"))
+)
+
+_room_id_by_code = lambda_stmt(
+    lambda: select(Room.id).where(Room.room_code == bindparam("room_code"))
+)
+
+_active_count_subq = (
+    select(func.count(RoomParticipant.id))
+    .where(
+        RoomParticipant.room_id == Room.id,
+        RoomParticipant.is_active == True,  # noqa: E712
+    )
+    .correlate(Room)
+    .scalar_subquery()
+)
+
+_room_detail_by_code = lambda_stmt(
+    lambda: select(Room, _active_count_subq.label("active_count"))
+    .options(selectinload(Room.participants).selectinload(RoomParticipant.user))
+    .where(Room.room_code == bindparam("room_code"))
+)
+
 
 def _generate_room_code(length: int = 8) -> str:
-    """Generate a unique room code like 'MX7K-A2QP'."""
-    chars = string.ascii_uppercase + string.digits
-    part1 = "".join(secrets.choice(chars) for _ in range(length // 2))
-    part2 = "".join(secrets.choice(chars) for _ in range(length // 2))
-    return f"{part1}-{part2}"
+    """Generate a random room code like 'MX7K-A2QP' (base32, 40 bits)."""
+    # One urandom read; 5 bytes encode to exactly 8 base32 characters
+    raw = base64.b32encode(secrets.token_bytes(5))[:length].decode()
+    return f"{raw[:length // 2]}-{raw[length // 2:]}"
 
 
 async def create_room(
     db: AsyncSession,
-    owner: User,
+    owner_id: int,
     name: str,
     max_participants: int = 10,
 ) -> Room:
     """Create a new meeting room."""
-    room_code = _generate_room_code()
-
-    room = Room(
-        room_code=room_code,
-        name=name,
-        owner_id=owner.id,
-        status=RoomStatus.ACTIVE,
-        max_participants=max_participants,
-    )
-    db.add(room)
-    await db.flush()
+    for _ in range(_ROOM_CODE_ATTEMPTS):
+        room = await _insert_room(
+            db, _generate_room_code(), owner_id, name, max_participants
+        )
+        if room is not None:
+            logger.info("Room created: %s by user %d", room.room_code, owner_id)
+            return room
+    raise RuntimeError("Could not allocate a unique room code")
 
-    # Owner auto-joins the room
-    participant = RoomParticipant(
-        room_id=room.id,
-        user_id=owner.id,
-        language_mode=LanguageMode.HINDI_TO_ENGLISH,
-        is_active=True,
-    )
-    db.add(participant)
-    await db.flush()
 
-    logger.info("Room created: %s by user %d", room_code, owner.id)
-    return room
+async def _insert_room(
+    db: AsyncSession,
+    room_code: str,
+    owner_id: int,
+    name: str,
+    max_participants: int,
+) -> Optional[Room]:
+    """Insert a room plus its owner participant; None if the code is taken."""
+    # One round-trip: INSERT the room in a CTE, INSERT the owner as the first
+    # participant from it, and map the new room row back onto a Room. A code
+    # collision inserts nothing, so both CTEs come back empty.
+    new_room = (
+        pg_insert(Room)
+        .values(
+            room_code=room_code,
+            name=name,
+            owner_id=owner_id,
+            status=RoomStatus.ACTIVE,
+            max_participants=max_participants,
+        )
+        .on_conflict_do_nothing(index_elements=[Room.room_code])
+        .returning(*Room.__table__.c)
+        .cte("new_room")
+    )
+    owner_participant = (
+        insert(RoomParticipant)
+        .from_select(
+            ["room_id", "user_id", "language_mode", "is_active"],
+            select(
+                new_room.c.id,
+                literal(owner_id),
+                literal(LanguageMode.HINDI_TO_ENGLISH, RoomParticipant.language_mode.type),
+                literal(True),
+            ),
+        )
+        .cte("owner_participant")
+    )
+    result = await db.execute(
+        select(Room)
+        .from_statement(select(new_room).add_cte(owner_participant))
+        .execution_options(has_writes=True)
+    )
+    return result.scalar_one_or_none()
 
 
 async def join_room(
     db: AsyncSession,
-    user: User,
+    user_id: int,
     room_code: str,
     language_mode: str = "hi_to_en",
 ) -> Optional[Room]:
     """Join an existing room by code."""
+    # One round-trip: the active room, this user's participant row (if any)
+    # and the room's active participant count
     result = await db.execute(
-        select(Room)
-        .options(selectinload(Room.participants))
+        select(Room, RoomParticipant, _active_count_subq.label("active_count"))
+        .outerjoin(
+            RoomParticipant,
+            and_(
+                RoomParticipant.room_id == Room.id,
+                RoomParticipant.user_id == user_id,
+            ),
+        )
         .where(Room.room_code == room_code, Room.status == RoomStatus.ACTIVE)
     )
-    room = result.scalar_one_or_none()
-    if room is None:
+    row = result.one_or_none()
+    if row is None:
         return None
-
-    # Check if user is already a participant
-    existing = await db.execute(
-        select(RoomParticipant).where(
-            RoomParticipant.room_id == room.id,
-            RoomParticipant.user_id == user.id,
-        )
-    )
-    participant = existing.scalar_one_or_none()
+    room, participant, active_count = row
 
     if participant:
         participant.is_active = True
         participant.language_mode = LanguageMode(language_mode)
     else:
         # Check max participants
-        count_result = await db.execute(
-            select(func.count(RoomParticipant.id)).where(
-                RoomParticipant.room_id == room.id,
-                RoomParticipant.is_active == True,  # noqa: E712
-            )
-        )
-        active_count = count_result.scalar() or 0
         if active_count >= room.max_participants:
             return None  # Room is full
 
         participant = RoomParticipant(
             room_id=room.id,
-            user_id=user.id,
+            user_id=user_id,
             language_mode=LanguageMode(language_mode),
             is_active=True,
         )
         db.add(participant)
 
     await db.flush()
-    logger.info("User %d joined room %s", user.id, room_code)
+    logger.info("User %d joined room %s", user_id, room_code)
     return room
 
 
-async def get_room_by_code(
-    db: AsyncSession, room_code: str
-) -> Optional[Room]:
-    """Get a room by its code."""
-    result = await db.execute(
-        select(Room)
-        .options(selectinload(Room.participants).selectinload(RoomParticipant.user))
-        .where(Room.room_code == room_code)
-    )
+async def get_room_by_code(db: AsyncSession, room_code: str) -> Optional[Room]:
+    """Get a room by its code (participants are not loaded)."""
+    result = await db.execute(_room_by_code, {"room_code": room_code})
     return result.scalar_one_or_none()
 
 
-async def get_user_rooms(db: AsyncSession, user_id: int) -> List[Room]:
-    """Get all rooms a user participates in."""
-    result = await db.execute(
+async def get_room_id_by_code(db: AsyncSession, room_code: str) -> Optional[int]:
+    """Get just a room's id by code, whatever its status."""
+    result = await db.execute(_room_id_by_code, {"room_code": room_code})
+    return result.scalar_one_or_none()
+
+
+async def get_room_detail_by_code(
+    db: AsyncSession, room_code: str
+) -> Optional[Tuple[Room, int]]:
+    """Get a room with participants loaded plus its active participant count."""
+    result = await db.execute(_room_detail_by_code, {"room_code": room_code})
+    row = result.one_or_none()
+    if row is None:
+        return None
+    room, active_count = row
+    return room, active_count
+
+
+def _user_rooms_stmt(user_id: int):
+    return (
         select(Room)
         .join(RoomParticipant)
         .where(RoomParticipant.user_id == user_id)
         .order_by(Room.created_at.desc())
     )
+
+
+async def get_user_rooms(
+    db: AsyncSession, user_id: int, limit: Optional[int] = None
+) -> List[Room]:
+    """Get the rooms a user participates in, newest first (optionally capped)."""
+    stmt = _user_rooms_stmt(user_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
+async def get_active_participant_counts(
+    db: AsyncSession, room_ids: List[int]
+) -> Dict[int, int]:
+    """Map room id → active participant count with a single GROUP BY query."""
+    if not room_ids:
+        return {}
+
+    result = await db.execute(
+        select(RoomParticipant.room_id, func.count())
+        .where(
+            RoomParticipant.room_id.in_(room_ids),
+            RoomParticipant.is_active == True,  # noqa: E712
+        )
+        .group_by(RoomParticipant.room_id)
+    )
+    return dict(result.all())
+
+
+async def stream_user_rooms(
+    user_id: int, batch_size: int = 50
+) -> AsyncIterator[Tuple[Room, int]]:
+    """
+    Stream (room, active_count) pairs over a server-side cursor.
+
+    Uses its own session so the cursor's connection lives exactly as long
+    as the StreamingResponse that consumes it.
+    """
+    async with async_session_factory() as db:
+        result = await db.stream(
+            _user_rooms_stmt(user_id)
+            .add_columns(_active_count_subq.label("active_count"))
+            .execution_options(yield_per=batch_size)
+        )
+        async for room, active_count in result:
+            yield room, active_count
+
+
 async def leave_room(db: AsyncSession, user_id: int, room_code: str) -> bool:
     """Mark a participant as inactive in a room."""
-    room = await get_room_by_code(db, room_code)
-    if room is None:
+    room_id = await get_room_id_by_code(db, room_code)
+    if room_id is None:
         return False
 
     result = await db.execute(
-        select(RoomParticipant).where(
-            RoomParticipant.room_id == room.id,
+        update(RoomParticipant)
+        .where(
+            RoomParticipant.room_id == room_id,
             RoomParticipant.user_id == user_id,
         )
+        .values(is_active=False)
+        .returning(RoomParticipant.id)
     )
-    participant = result.scalar_one_or_none()
-    if participant:
-        participant.is_active = False
-        await db.flush()
-        return True
-    return False
+    return result.scalar_one_or_none() is not None
 
 
 async def end_room(db: AsyncSession, room: Room) -> Room:
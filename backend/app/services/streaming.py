@@ -0,0 +1,124 @@
+"""
+Incremental (streaming) transcription per speaker.
+
+Consecutive audio chunks from one participant are accumulated into a
+single utterance buffer that is re-transcribed as it grows. Whisper pads
+every input to a fixed 30 s window, so re-running the encoder on a longer
+buffer costs no more than on the newest chunk alone — and the model sees
+the whole sentence instead of an isolated 5 s slice.
+
+Words are emitted with the local-agreement policy: a word prefix is only
+shown once two consecutive hypotheses agree on it. The utterance is
+finalized (handed on for translation / TTS) on a pause, once two passes
+agree completely, or when the buffer reaches its length cap. The tail of
+the last finalized utterance is carried over as the next prompt.
+
+The cap (STREAM_MAX_UTTERANCE_S) defaults to about one client chunk, so
+by default every chunk is finalized on its first pass and nothing is
+re-decoded; raising it buys context and partials for latency.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.transcription import SAMPLE_RATE, transcribe_pcm
+
+# Finalize once the buffered utterance reaches this length
+MAX_UTTERANCE_S = settings.STREAM_MAX_UTTERANCE_S
+# Finalize a pending utterance if no chunk arrives for this long (the
+# client stopped recording mid-sentence)
+IDLE_FLUSH_S = 7.0
+# Characters of the previous utterance fed back as the prompt
+_PROMPT_CHARS = 200
+
+
+def _common_prefix(a: List[str], b: List[str]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+@dataclass
+class StreamUpdate:
+    """Result of feeding one chunk to a StreamingBuffer."""
+    # Newly agreed partial text for the utterance in progress, if any
+    partial: Optional[dict] = None
+    # Utterances finalized by this chunk, oldest first
+    finals: List[dict] = field(default_factory=list)
+
+
+class StreamingBuffer:
+    """Per-speaker utterance buffer with local-agreement partial output."""
+
+    def __init__(self):
+        self._prompt = ""
+        self._reset_utterance()
+
+    def _reset_utterance(self) -> None:
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._hypothesis: List[str] = []
+        self._emitted = 0  # words of the hypothesis already shown
+        self._last_result: Optional[dict] = None
+        self.message_id = uuid.uuid4().hex
+
+    @property
+    def has_pending(self) -> bool:
+        """True while an utterance is buffered but not yet finalized."""
+        return self._audio.size > 0
+
+    def flush(self) -> Optional[dict]:
+        """Finalize the buffered utterance (pause, idle timeout or length cap)."""
+        result = self._last_result
+        message_id = self.message_id
+        self._reset_utterance()
+        if result is None or not result["text"].strip():
+            return None
+        self._prompt = result["text"][-_PROMPT_CHARS:]
+        return {**result, "message_id": message_id}
+
+    async def push(self, audio: Optional[np.ndarray]) -> StreamUpdate:
+        """
+        Feed one decoded chunk; None means the chunk was silence (a pause).
+        """
+        update = StreamUpdate()
+        if audio is None:
+            final = self.flush()
+            if final is not None:
+                update.finals.append(final)
+            return update
+
+        max_samples = int(MAX_UTTERANCE_S * SAMPLE_RATE)
+        if self.has_pending and self._audio.size + audio.size > max_samples:
+            final = self.flush()
+            if final is not None:
+                update.finals.append(final)
+
+        self._audio = np.concatenate([self._audio, audio])
+        result = await transcribe_pcm(self._audio, self._prompt)
+        self._last_result = result
+
+        words = result["text"].split()
+        agreed = _common_prefix(self._hypothesis, words)
+        fully_agreed = bool(words) and agreed == len(words) == len(self._hypothesis)
+        self._hypothesis = words
+
+        if fully_agreed or self._audio.size >= max_samples:
+            final = self.flush()
+            if final is not None:
+                update.finals.append(final)
+        elif agreed > self._emitted:
+            self._emitted = agreed
+            update.partial = {
+                "message_id": self.message_id,
+                "text": " ".join(words[:agreed]),
+                "language": result["language"],
+                "confidence": result["confidence"],
+            }
+        return update
@@ -1,39 +1,274 @@
 """
 Whisper-based speech-to-text transcription service.
 
-Uses OpenAI Whisper locally. Audio bytes are saved to a temp file,
-transcribed, and then the temp file is removed.
+Uses faster-whisper (CTranslate2) locally. Concurrent requests (e.g. several
+speakers talking at once) are coalesced by a background worker into a
+single padded batch, so N utterances share one encoder / decoder pass
+instead of running N serial forward passes. Each input is a single 30 s
+Whisper window; the streaming buffer finalizes utterances well before that.
+Chunks that are (almost) all silence are dropped by Silero VAD before they
+ever reach the encoder.
+
+All decoding and inference runs on a bounded thread pool (CTranslate2
+releases the GIL), so the event loop keeps serving other rooms meanwhile.
 """
 
-import os
-import tempfile
+import asyncio
+import io
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
 
-import whisper
+import ctranslate2
 import numpy as np
+from faster_whisper import WhisperModel, decode_audio
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import get_suppressed_tokens
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Global model reference — loaded once per process
-_model = None
+SAMPLE_RATE = 16000
+
+# Micro-batching — collect up to _MAX_BATCH requests or wait _MAX_WAIT_S
+_MAX_BATCH = 8
+_MAX_WAIT_S = 0.03
+_BEAM_SIZE = 5
+_NO_SPEECH_THRESHOLD = 0.6
+_LOGPROB_THRESHOLD = -1.0
+
+# VAD gate — skip Whisper when less than this fraction of a chunk is speech
+_MIN_SPEECH_RATIO = 0.1
+_VAD_OPTIONS = VadOptions(min_speech_duration_ms=150)
+
+_EMPTY_RESULT = {"text": "", "language": "en", "confidence": 0.0}
+
+# Inference threads. Each runs one CTranslate2 model replica (num_workers)
+# with WHISPER_THREADS intra-op threads, and there are only as many as fit
+# in WHISPER_CORES (nproc minus two for the event loop), so concurrent
+# batches never oversubscribe the cores. This also
+# bounds how many batches hold model / GPU memory at once.
+_CPU_THREADS = settings.WHISPER_THREADS
+_INFERENCE_WORKERS = max(1, settings.WHISPER_CORES // _CPU_THREADS)
+_executor = ThreadPoolExecutor(
+    max_workers=_INFERENCE_WORKERS, thread_name_prefix="whisper"
+)
+
+# Global model references — loaded once per process
+_model: Optional[WhisperModel] = None
+_model_lock = threading.Lock()
+
+# Pending (audio, prompt, future) items, the worker draining them, and the
+# semaphore capping batches in flight to the number of inference threads
+_queue: Optional[asyncio.Queue] = None
+_worker: Optional[asyncio.Task] = None
+_slots: Optional[asyncio.Semaphore] = None
+_in_flight: Set[asyncio.Task] = set()
 
 
-def _get_model():
+def _get_model() -> WhisperModel:
     """Lazy-load the Whisper model."""
     global _model
-    if _model is None:
-        logger.info("Loading Whisper model: %s …", settings.WHISPER_MODEL)
-        _model = whisper.load_model(settings.WHISPER_MODEL)
-        logger.info("Whisper model loaded successfully.")
+    with _model_lock:
+        if _model is None:
+            if ctranslate2.get_cuda_device_count() > 0:
+                device, compute_type = "cuda", "int8_float16"
+            else:
+                device, compute_type = "cpu", "int8"
+            if settings.WHISPER_COMPUTE_TYPE != "auto":
+                compute_type = settings.WHISPER_COMPUTE_TYPE
+            logger.info(
+                "Loading Whisper model: %s (%s, %s, %d×%d threads) …",
+                settings.WHISPER_MODEL,
+                device,
+                compute_type,
+                _INFERENCE_WORKERS,
+                _CPU_THREADS,
+            )
+            _model = WhisperModel(
+                settings.WHISPER_MODEL,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=_CPU_THREADS,
+                num_workers=_INFERENCE_WORKERS,
+            )
+            logger.info("Whisper model loaded successfully.")
     return _model
 
 
-async def transcribe_audio(audio_bytes: bytes) -> dict:
+def _to_confidence(avg_logprob: float) -> float:
+    """Convert an average log-probability to a 0-1 confidence heuristic."""
+    return round(max(0.0, min(1.0, 1.0 + avg_logprob)), 3)
+
+
+def _transcribe_window_batch(
+    audios: List[np.ndarray], prompts: List[str]
+) -> List[dict]:
+    """
+    Transcribe up to one 30 s window per item in a single forward pass
+    (anything longer is truncated by ``pad_or_trim``).
+
+    Every item is padded to the fixed Whisper window anyway, so stacking
+    them costs no extra padding; language is detected per item and written
+    into each prompt's language slot. A non-empty text prompt is passed as
+    previous-context tokens, as with ``initial_prompt``.
+    """
+    model = _get_model()
+    multilingual = model.model.is_multilingual
+    tokenizer = Tokenizer(
+        model.hf_tokenizer, multilingual, task="transcribe", language="en"
+    )
+
+    features = np.stack(
+        [pad_or_trim(model.feature_extractor(a)[..., :-1]) for a in audios]
+    )
+    encoder_output = model.encode(features)
+
+    prompt_tokens = [
+        model.get_prompt(
+            tokenizer,
+            previous_tokens=tokenizer.encode(" " + text.strip()) if text else [],
+            without_timestamps=True,
+        )
+        for text in prompts
+    ]
+    languages = ["en"] * len(audios)
+    if multilingual:
+        detected = model.model.detect_language(encoder_output)
+        for i, lang_probs in enumerate(detected):
+            token = lang_probs[0][0]  # e.g. "<|hi|>", highest probability first
+            lang_index = prompt_tokens[i].index(tokenizer.language)
+            prompt_tokens[i][lang_index] = tokenizer.tokenizer.token_to_id(token)
+            languages[i] = token[2:-2]
+
+    results = model.model.generate(
+        encoder_output,
+        prompt_tokens,
+        beam_size=_BEAM_SIZE,
+        max_length=model.max_length,
+        suppress_blank=True,
+        suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+        return_scores=True,
+        return_no_speech_prob=True,
+    )
+
+    output = []
+    for result, language in zip(results, languages):
+        tokens = result.sequences_ids[0]
+        seq_len = len(tokens)
+        avg_logprob = result.scores[0] * seq_len / (seq_len + 1)
+
+        # Whisper's standard silence rule: likely no speech and low confidence
+        if (
+            result.no_speech_prob > _NO_SPEECH_THRESHOLD
+            and avg_logprob < _LOGPROB_THRESHOLD
+        ):
+            output.append({"text": "", "language": language, "confidence": 0.0})
+            continue
+
+        output.append(
+            {
+                "text": tokenizer.decode(tokens).strip(),
+                "language": language,
+                "confidence": _to_confidence(avg_logprob),
+            }
+        )
+    return output
+
+
+def _transcribe_batch(items: List[Tuple[np.ndarray, str]]) -> List[dict]:
+    """Transcribe drained (audio, prompt) items in order (runs on the executor)."""
+    return _transcribe_window_batch([a for a, _ in items], [p for _, p in items])
+
+
+async def _run_batch(batch: List[Tuple[np.ndarray, str, asyncio.Future]]) -> None:
+    """Transcribe a batch off the event loop and resolve each request's future."""
+    try:
+        results = await asyncio.get_running_loop().run_in_executor(
+            _executor, _transcribe_batch, [(a, p) for a, p, _ in batch]
+        )
+        for (_, _, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+    except Exception as exc:
+        for _, _, fut in batch:
+            if not fut.done():
+                fut.set_exception(exc)
+    finally:
+        _slots.release()
+
+
+async def _batch_worker() -> None:
+    """Drain the queue in micro-batches: up to _MAX_BATCH or _MAX_WAIT_S."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _queue.get()]
+        deadline = loop.time() + _MAX_WAIT_S
+        while len(batch) < _MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        if len(batch) > 1:
+            logger.debug("Transcribing micro-batch of %d", len(batch))
+        # Wait for a free inference thread; requests arriving meanwhile
+        # queue up and form the next batch
+        await _slots.acquire()
+        task = asyncio.create_task(_run_batch(batch))
+        _in_flight.add(task)
+        task.add_done_callback(_in_flight.discard)
+
+
+def _speech_ratio(audio: np.ndarray) -> float:
+    """Fraction of samples Silero VAD classifies as speech."""
+    segments = get_speech_timestamps(audio, _VAD_OPTIONS, sampling_rate=SAMPLE_RATE)
+    return sum(s["end"] - s["start"] for s in segments) / len(audio)
+
+
+def _decode_speech(audio_bytes: bytes) -> Optional[np.ndarray]:
+    """Decode a chunk; None if it is empty or (near-)silent."""
+    audio = decode_audio(io.BytesIO(audio_bytes), sampling_rate=SAMPLE_RATE)
+    if audio.size == 0:
+        return None
+    if settings.WHISPER_VAD_GATE and _speech_ratio(audio) < _MIN_SPEECH_RATIO:
+        return None
+    return audio
+
+
+def _ensure_worker() -> None:
+    """Start the batch worker on the running loop if it isn't alive."""
+    global _queue, _worker, _slots
+    if _worker is None or _worker.done():
+        _queue = asyncio.Queue()
+        _slots = asyncio.Semaphore(_INFERENCE_WORKERS)
+        _worker = asyncio.create_task(_batch_worker())
+
+
+async def decode_speech(audio_bytes: bytes) -> Optional[np.ndarray]:
     """
-    Transcribe raw audio bytes (WebM / WAV / MP3).
+    Decode raw audio bytes (WebM / WAV / MP3) to 16 kHz mono float32 PCM.
+
+    Returns None for empty or (near-)silent chunks.
+    """
+    # Decode in memory (PyAV handles WebM/Opus, WAV and MP3) — no temp
+    # file, no ffmpeg subprocess — and drop silent chunks before they cost
+    # an encoder pass
+    return await asyncio.get_running_loop().run_in_executor(
+        None, _decode_speech, audio_bytes
+    )
+
+
+async def transcribe_pcm(audio: np.ndarray, prompt: str = "") -> dict:
+    """
+    Transcribe decoded 16 kHz PCM, optionally conditioned on prior text.
 
     Returns:
         {
@@ -42,60 +277,20 @@ async def transcribe_audio(audio_bytes: bytes) -> dict:
             "confidence": float
         }
     """
-    tmp_path: Optional[str] = None
     try:
-        # Write audio bytes to a temporary file
-        with tempfile.NamedTemporaryFile(
-            suffix=".webm", delete=False, dir=tempfile.gettempdir()
-        ) as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
-
-        model = _get_model()
-
-        # Transcribe — Whisper handles format detection internally
-        result = model.transcribe(
-            tmp_path,
-            fp16=False,  # Safe for CPU; GPU users can enable
-            language=None,  # Auto-detect
-            task="transcribe",
-        )
-
-        text = (result.get("text") or "").strip()
-        detected_lang = result.get("language", "en")
-
-        # Whisper doesn't give a single confidence score; approximate from
-        # the average log-probability of the first segment.
-        segments = result.get("segments", [])
-        if segments:
-            avg_logprob = float(
-                np.mean([s.get("avg_logprob", -1.0) for s in segments])
-            )
-            # Convert log-prob to a 0-1 confidence heuristic
-            confidence = round(max(0.0, min(1.0, 1.0 + avg_logprob)), 3)
-        else:
-            confidence = 0.0
+        _ensure_worker()
+        fut = asyncio.get_running_loop().create_future()
+        await _queue.put((audio, prompt, fut))
+        result = await fut
 
         logger.info(
             "Transcription complete — lang=%s, conf=%.3f, text_len=%d",
-            detected_lang,
-            confidence,
-            len(text),
+            result["language"],
+            result["confidence"],
+            len(result["text"]),
         )
-
-        return {
-            "text": text,
-            "language": detected_lang,
-            "confidence": confidence,
-        }
+        return result
 
     except Exception as exc:
         logger.exception("Transcription failed: %s", exc)
-        return {"text": "", "language": "en", "confidence": 0.0}
-
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+        return dict(_EMPTY_RESULT)
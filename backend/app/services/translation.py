@@ -2,28 +2,86 @@
 Translation service using deep-translator (Google Translate backend).
 
 Supports Hindi ↔ English translation with language auto-detection fallback.
+Results are cached in a per-process LRU in front of Redis, so repeated
+phrases skip the Google round-trip entirely.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Tuple
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional, Tuple
 
+import requests
 from deep_translator import GoogleTranslator
-from langdetect import detect, LangDetectException
+from deep_translator import google as _google_backend
+from langdetect import DetectorFactory, detect, LangDetectException
+from langdetect.detector_factory import init_factory
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-logger = logging.getLogger(__name__)
-
-# Pre-initialised translators
-_hi_to_en = GoogleTranslator(source="hi", target="en")
-_en_to_hi = GoogleTranslator(source="en", target="hi")
+from app.core.cache import cache_get, cache_set
+from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-def detect_language(text: str) -> str:
+# Per-process LRU in front of Redis: cache key → translated text
+_LOCAL_CACHE_SIZE = 4096
+_local_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Shared keep-alive HTTP session for the Google backend. deep-translator
+# calls the module-level ``requests.get`` for every translation, which opens
+# a fresh TCP + TLS connection each time; route it through one pooled session.
+_http = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_http.mount("https://", _adapter)
+_http.mount("http://", _adapter)
+_google_backend.requests = _http
+
+
+def _translate_blocking(text: str, source_lang: str, target_lang: str) -> Optional[str]:
     """
-    Detect language of text.
-    Returns 'hi' for Hindi, 'en' for English (default).
+    Translate on a worker thread. GoogleTranslator.translate() mutates the
+    instance's request params, so each call builds its own (cheap) translator;
+    the pooled session above is what carries over between calls.
     """
+    return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+
+
+def _cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    digest = blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return f"tr:{source_lang}:{target_lang}:{digest}"
+
+
+def _local_get(key: str) -> Optional[str]:
+    value = _local_cache.get(key)
+    if value is not None:
+        _local_cache.move_to_end(key)
+    return value
+
+
+def _local_set(key: str, value: str) -> None:
+    _local_cache[key] = value
+    _local_cache.move_to_end(key)
+    if len(_local_cache) > _LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+# Load langdetect's n-gram profiles at import rather than on the first
+# utterance, and make it deterministic so cached answers are stable
+DetectorFactory.seed = 0
+init_factory()
+
+
+@functools.lru_cache(maxsize=2048)
+def _detect_prefix(prefix: str) -> str:
     try:
-        lang = detect(text)
+        lang = detect(prefix)
         if lang in ("hi", "mr", "ne", "sa"):  # Devanagari-family fallback
             return "hi"
         return "en"
@@ -31,6 +89,17 @@ def detect_language(text: str) -> str:
         return "en"
 
 
+def detect_language(text: str) -> str:
+    """
+    Detect language of text.
+    Returns 'hi' for Hindi, 'en' for English (default).
+
+    Only the first 80 characters are scored, which is plenty to tell the
+    scripts apart, and results are memoised on that prefix.
+    """
+    return _detect_prefix(text.strip()[:80])
+
+
 async def translate_text(
     text: str,
     source_lang: str = "auto",
@@ -52,24 +121,36 @@ async def translate_text(
 
     # Auto-detect source language if needed
     if source_lang == "auto":
-        source_lang = detect_language(text)
+        source_lang = await asyncio.get_running_loop().run_in_executor(
+            None, detect_language, text
+        )
 
     # Determine target if both are the same
     if source_lang == target_lang:
         target_lang = "en" if source_lang == "hi" else "hi"
 
+    # Cache lookup: in-process LRU, then Redis
+    text = text.strip()
+    key = _cache_key(text, source_lang, target_lang)
+    cached = _local_get(key)
+    if cached is None:
+        cached = await cache_get(key)
+        if cached is not None:
+            _local_set(key, cached)
+    if cached is not None:
+        return cached, source_lang, target_lang
+
     try:
-        if source_lang == "hi" and target_lang == "en":
-            translated = _hi_to_en.translate(text)
-        elif source_lang == "en" and target_lang == "hi":
-            translated = _en_to_hi.translate(text)
-        else:
-            # Fallback — create a dynamic translator
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            translated = translator.translate(text)
+        # deep-translator is a blocking HTTP client — keep it off the loop
+        translated = await asyncio.get_running_loop().run_in_executor(
+            None, _translate_blocking, text, source_lang, target_lang
+        )
 
         if translated is None:
             translated = text
+        elif translated.strip():
+            _local_set(key, translated)
+            await cache_set(key, translated, settings.TRANSLATION_CACHE_TTL_SECONDS)
 
         logger.info(
             "Translation %s→%s  |  '%s' → '%s'",
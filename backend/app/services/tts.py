@@ -1,14 +1,26 @@
 """
 Edge-TTS voice synthesis service.
 
-Generates an MP3 file from translated text using Microsoft Edge TTS voices.
-Returns the file path relative to the static directory so it can be served
-via FastAPI's StaticFiles mount.
+Streams MP3 audio for translated text from Microsoft Edge TTS voices and
+caches it in two tiers, both keyed by a hash of voice and text:
+
+  1. A per-process in-memory LRU, served straight from the ``/tts/{key}``
+     route.
+  2. Content-addressed ``{key}.mp3`` files in AUDIO_DIR, which survive
+     restarts and evictions from memory. A background janitor keeps the
+     directory under TTS_CACHE_MB by deleting the least recently used files.
+
+Repeated phrases therefore skip the Edge round-trip entirely, and
+concurrent requests for the same clip share one synthesis.
 """
 
-import os
-import uuid
+import asyncio
 import logging
+import os
+import tempfile
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict, Optional
 
 import edge_tts
 
@@ -22,34 +34,192 @@ VOICES = {
     "hi": "hi-IN-SwaraNeural",
 }
 
+# Per-process LRU: content key → MP3 bytes
+_TTS_CACHE_SIZE = 512
+_tts_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+# Syntheses in progress: content key → future resolving to the clip URL
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Disk tier eviction interval
+_JANITOR_INTERVAL_S = 60
+
+_janitor: Optional[asyncio.Task] = None
+
+
+def _tts_key(voice: str, text: str) -> str:
+    return blake2b(f"{voice}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def audio_path(key: str) -> str:
+    """Disk-tier location of a clip."""
+    return os.path.join(settings.AUDIO_DIR, f"{key}.mp3")
+
+
+def get_cached_audio(key: str) -> Optional[bytes]:
+    """Return the in-memory MP3 bytes for a key, or None if not held."""
+    audio = _tts_cache.get(key)
+    if audio is not None:
+        _tts_cache.move_to_end(key)
+    return audio
+
+
+def _cache_audio(key: str, audio: bytes) -> None:
+    _tts_cache[key] = audio
+    _tts_cache.move_to_end(key)
+    if len(_tts_cache) > _TTS_CACHE_SIZE:
+        _tts_cache.popitem(last=False)
+
+
+def _touch(path: str) -> bool:
+    """Mark a disk clip as recently used; False if it doesn't exist."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _write_atomic(path: str, audio: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
 
 async def synthesize_speech(text: str, language: str = "en") -> str:
     """
-    Convert text to speech and save as an MP3 file.
+    Convert text to speech, caching the MP3 in memory and on disk.
 
     Args:
         text:     The text to speak.
         language: Target language code ("en" or "hi").
 
     Returns:
-        Relative URL path to the generated audio file, e.g.
-        "/static/audio/abc123.mp3"
+        Relative URL of the generated audio, e.g. "/tts/9f86d081…", or ""
+        if synthesis failed.
     """
     if not text or not text.strip():
         return ""
 
     voice = VOICES.get(language, VOICES["en"])
-    filename = f"{uuid.uuid4().hex}.mp3"
-    filepath = os.path.join(settings.AUDIO_DIR, filename)
+    key = _tts_key(voice, text.strip())
+    relative_url = f"/tts/{key}"
+    loop = asyncio.get_running_loop()
+
+    if get_cached_audio(key) is not None:
+        return relative_url
+    if await loop.run_in_executor(None, _touch, audio_path(key)):
+        return relative_url
+
+    # Join a synthesis of the same clip that is already under way
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
 
+    future = loop.create_future()
+    _inflight[key] = future
     try:
-        communicate = edge_tts.Communicate(text, voice)
-        await communicate.save(filepath)
+        url = await _synthesize(text, language, voice, key)
+        future.set_result(url)
+        return url
+    finally:
+        del _inflight[key]
+        if not future.done():  # cancelled: waiters fall back to no audio
+            future.set_result("")
 
-        relative_url = f"/static/audio/{filename}"
-        logger.info("TTS generated: %s (%s, %s)", relative_url, language, voice)
-        return relative_url
 
+async def _synthesize(text: str, language: str, voice: str, key: str) -> str:
+    """Stream one clip from Edge TTS into both cache tiers; "" on failure."""
+    relative_url = f"/tts/{key}"
+    try:
+        communicate = edge_tts.Communicate(text, voice)
+        buf = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                buf.extend(chunk["data"])
+        if not buf:
+            return ""
     except Exception as exc:
         logger.exception("TTS synthesis failed: %s", exc)
         return ""
+
+    audio = bytes(buf)
+    _cache_audio(key, audio)
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, _write_atomic, audio_path(key), audio
+        )
+    except OSError as exc:
+        # Still served from memory; only the disk tier misses it
+        logger.warning("TTS disk cache write failed for %s: %s", key, exc)
+    logger.info("TTS generated: %s (%s, %s)", relative_url, language, voice)
+    return relative_url
+
+
+# ---------------------------------------------------------------------------
+# Disk tier eviction
+# ---------------------------------------------------------------------------
+def _evict_disk_cache(max_bytes: int) -> int:
+    """Delete least recently used clips until AUDIO_DIR fits; return count."""
+    files = []
+    total = 0
+    with os.scandir(settings.AUDIO_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+    removed = 0
+    files.sort()  # oldest first
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+async def _janitor_loop() -> None:
+    loop = asyncio.get_running_loop()
+    max_bytes = settings.TTS_CACHE_MB * 1024 * 1024
+    while True:
+        try:
+            removed = await loop.run_in_executor(None, _evict_disk_cache, max_bytes)
+            if removed:
+                logger.info("TTS disk cache: evicted %d clip(s)", removed)
+        except Exception as exc:
+            logger.warning("TTS disk cache eviction failed: %s", exc)
+        await asyncio.sleep(_JANITOR_INTERVAL_S)
+
+
+def start_tts_janitor() -> None:
+    """Start the disk-tier eviction task on the running loop (app startup)."""
+    global _janitor
+    if _janitor is None or _janitor.done():
+        _janitor = asyncio.create_task(_janitor_loop())
+
+
+async def stop_tts_janitor() -> None:
+    """Cancel the disk-tier eviction task (app shutdown)."""
+    global _janitor
+    if _janitor is None:
+        return
+    _janitor.cancel()
+    try:
+        await _janitor
+    except asyncio.CancelledError:
+        pass
+    _janitor = None
@@ -4,94 +4,155 @@ WebSocket route handler for real-time meeting audio processing.
 Flow:
   1. Client connects with JWT token via query parameter
   2. Client sends binary audio chunks
-  3. Server transcribes (Whisper) → translates → synthesizes (Edge-TTS)
-  4. Server broadcasts results to all room participants
+  3. Server transcribes the speaker's growing utterance (Whisper) and
+     broadcasts newly agreed words as partial_transcript; the utterance is
+     finalized on a pause, on agreement, or at its length cap
+  4. Server translates and broadcasts the translation_result while Edge-TTS
+     synthesizes in the background, then broadcasts audio_ready
+  5. The message is queued for the batched database writer
 """
 
+import asyncio
 import json
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, bindparam, lambda_stmt, select
 
+from app.core.dependencies import is_token_revoked
 from app.core.security import decode_access_token
 from app.db.session import async_session_factory
-from app.db.models import User, Room, RoomParticipant, MessageLog, RoomStatus
-from app.services.transcription import transcribe_audio
+from app.db.models import User, Room, RoomParticipant, RoomStatus
+from app.services.message_log import save_message
+from app.services.streaming import IDLE_FLUSH_S
+from app.services.transcription import decode_speech
 from app.services.translation import translate_text, detect_language
 from app.services.tts import synthesize_speech
-from app.websocket.manager import manager
+from app.websocket.manager import Participant, manager
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# One round-trip at connect time: the user, the active room (NULL if the
+# code is unknown or the room ended) and the user's participant row, if any
+_ws_context = lambda_stmt(
+    lambda: select(
+        User.id,
+        User.username,
+        Room.id.label("room_id"),
+        RoomParticipant.language_mode,
+    )
+    .select_from(User)
+    .outerjoin(
+        Room,
+        and_(
+            Room.room_code == bindparam("room_code"),
+            Room.status == RoomStatus.ACTIVE,
+        ),
+    )
+    .outerjoin(
+        RoomParticipant,
+        and_(
+            RoomParticipant.room_id == Room.id,
+            RoomParticipant.user_id == User.id,
+        ),
+    )
+    .where(User.id == bindparam("user_id"))
+)
+
 
-async def _authenticate_ws(token: str):
-    """Validate JWT token and return the user, or None."""
+async def _load_ws_context(token: str, room_code: str):
+    """
+    Validate the JWT and load everything the socket needs in one query.
+
+    Returns a row with ``id``, ``username``, ``room_id`` and
+    ``language_mode``, or None if the token / user is invalid.
+    """
     payload = decode_access_token(token)
     if payload is None:
         return None
 
     user_id = payload.get("sub")
-    if user_id is None:
+    if user_id is None or await is_token_revoked(payload):
         return None
 
-    async with async_session_factory() as db:
-        result = await db.execute(select(User).where(User.id == int(user_id)))
-        user = result.scalar_one_or_none()
-        return user
-
-
-async def _get_participant_mode(user_id: int, room_code: str) -> str:
-    """Look up the participant's language mode from the database."""
     async with async_session_factory() as db:
         result = await db.execute(
-            select(RoomParticipant)
-            .join(Room)
-            .where(
-                Room.room_code == room_code,
-                RoomParticipant.user_id == user_id,
-            )
+            _ws_context, {"user_id": int(user_id), "room_code": room_code}
         )
-        rp = result.scalar_one_or_none()
-        if rp and hasattr(rp.language_mode, "value"):
-            return rp.language_mode.value
-        return "hi_to_en"
+        return result.one_or_none()
 
 
-async def _save_message(
-    room_code: str,
-    user_id: int,
-    original_text: str,
-    translated_text: str,
-    source_lang: str,
-    target_lang: str,
-    audio_url: str,
-    confidence: float,
+async def _process_utterance(
+    room_code: str, participant: Participant, transcription: dict
 ):
-    """Persist a message log entry."""
-    async with async_session_factory() as db:
-        result = await db.execute(
-            select(Room).where(Room.room_code == room_code)
-        )
-        room = result.scalar_one_or_none()
-        if room is None:
-            return
-
-        msg = MessageLog(
-            room_id=room.id,
-            user_id=user_id,
-            original_text=original_text,
-            translated_text=translated_text,
-            source_language=source_lang,
-            target_language=target_lang,
-            audio_url=audio_url,
-            confidence=confidence,
+    """Translate, voice, broadcast and log one finalized utterance."""
+    original_text = transcription["text"]
+    detected_lang = transcription["language"]
+    confidence = transcription["confidence"]
+    message_id = transcription["message_id"]
+
+    # 2. Determine target language from participant mode
+    if participant.language_mode == "hi_to_en":
+        source_lang = "hi"
+        target_lang = "en"
+    else:
+        source_lang = "en"
+        target_lang = "hi"
+
+    # Override source with detected if confident
+    if confidence > 0.5:
+        source_lang = detected_lang
+
+    # 3. Translate
+    translated_text, src, tgt = await translate_text(
+        original_text,
+        source_lang=source_lang,
+        target_lang=target_lang,
+    )
+
+    # 4/5. Text-to-Speech runs while the results are broadcast to all
+    # participants (and sent to the speaker themselves)
+    result_data = {
+        "type": "translation_result",
+        "message_id": message_id,
+        "user_id": participant.user_id,
+        "username": participant.username,
+        "original_text": original_text,
+        "translated_text": translated_text,
+        "source_language": src,
+        "target_language": tgt,
+        "audio_url": "",
+        "confidence": confidence,
+    }
+    async with asyncio.TaskGroup() as tg:
+        tts_task = tg.create_task(synthesize_speech(translated_text, tgt))
+        tg.create_task(manager.broadcast_json(room_code, result_data))
+        tg.create_task(manager.send_to_participant(participant, result_data))
+
+    audio_url = tts_task.result()
+    if audio_url:
+        await manager.broadcast_json(
+            room_code,
+            {
+                "type": "audio_ready",
+                "message_id": message_id,
+                "audio_url": audio_url,
+            },
         )
-        db.add(msg)
-        await db.commit()
+
+    # 6. Queue for the batched database writer
+    save_message(
+        room_id=participant.room_id,
+        user_id=participant.user_id,
+        original_text=original_text,
+        translated_text=translated_text,
+        source_lang=src,
+        target_lang=tgt,
+        audio_url=audio_url,
+        confidence=confidence,
+    )
 
 
 @router.websocket("/ws/{room_code}")
@@ -109,32 +170,21 @@ async def websocket_meeting(
     Binary messages: audio chunks (WebM/WAV)
     Text messages:   JSON control messages
     """
-    # --- Authenticate ---
-    user = await _authenticate_ws(token)
+    # --- Authenticate, validate room and get language mode ---
+    user = await _load_ws_context(token, room_code)
     if user is None:
         await websocket.close(code=4001, reason="Authentication failed")
         return
-
-    # --- Validate room ---
-    async with async_session_factory() as db:
-        result = await db.execute(
-            select(Room).where(
-                Room.room_code == room_code,
-                Room.status == RoomStatus.ACTIVE,
-            )
-        )
-        room = result.scalar_one_or_none()
-        if room is None:
-            await websocket.close(code=4002, reason="Room not found or ended")
-            return
-
-    # --- Get language mode ---
-    language_mode = await _get_participant_mode(user.id, room_code)
+    if user.room_id is None:
+        await websocket.close(code=4002, reason="Room not found or ended")
+        return
+    language_mode = user.language_mode.value if user.language_mode else "hi_to_en"
 
     # --- Connect ---
     participant = await manager.connect(
         websocket=websocket,
         room_code=room_code,
+        room_id=user.room_id,
         user_id=user.id,
         username=user.username,
         language_mode=language_mode,
@@ -153,10 +203,27 @@ async def websocket_meeting(
         },
     )
 
+    stream = participant.stream
     try:
         while True:
-            # Wait for audio or text messages
-            message = await websocket.receive()
+            # Wait for audio or text messages; finalize a pending utterance
+            # if the speaker goes quiet without sending a silent chunk
+            if stream.has_pending:
+                try:
+                    message = await asyncio.wait_for(
+                        websocket.receive(), timeout=IDLE_FLUSH_S
+                    )
+                except asyncio.TimeoutError:
+                    final = stream.flush()
+                    if final is not None:
+                        await _process_utterance(room_code, participant, final)
+                    continue
+            else:
+                message = await websocket.receive()
+
+            if message["type"] == "websocket.disconnect":
+                # Client went away, or the manager closed a dead socket
+                raise WebSocketDisconnect(message.get("code", 1000))
 
             if "bytes" in message:
                 # --- Binary audio chunk ---
@@ -164,66 +231,31 @@ async def websocket_meeting(
                 if len(audio_bytes) < 100:
                     continue  # Skip tiny/empty frames
 
-                # 1. Transcribe
-                transcription = await transcribe_audio(audio_bytes)
-                original_text = transcription["text"]
-                detected_lang = transcription["language"]
-                confidence = transcription["confidence"]
-
-                if not original_text.strip():
-                    continue  # Skip empty transcriptions
-
-                # 2. Determine target language from participant mode
-                if language_mode == "hi_to_en":
-                    source_lang = "hi"
-                    target_lang = "en"
-                else:
-                    source_lang = "en"
-                    target_lang = "hi"
-
-                # Override source with detected if confident
-                if confidence > 0.5:
-                    source_lang = detected_lang
-
-                # 3. Translate
-                translated_text, src, tgt = await translate_text(
-                    original_text,
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                )
-
-                # 4. Text-to-Speech
-                audio_url = await synthesize_speech(translated_text, tgt)
-
-                # 5. Broadcast results to all participants
-                result_data = {
-                    "type": "translation_result",
-                    "user_id": user.id,
-                    "username": user.username,
-                    "original_text": original_text,
-                    "translated_text": translated_text,
-                    "source_language": src,
-                    "target_language": tgt,
-                    "audio_url": audio_url,
-                    "confidence": confidence,
-                }
-
-                await manager.broadcast_json(room_code, result_data)
-
-                # Also send to the speaker themselves
-                await manager.send_to_participant(participant, result_data)
-
-                # 6. Save to database asynchronously
-                await _save_message(
-                    room_code=room_code,
-                    user_id=user.id,
-                    original_text=original_text,
-                    translated_text=translated_text,
-                    source_lang=src,
-                    target_lang=tgt,
-                    audio_url=audio_url,
-                    confidence=confidence,
-                )
+                # 1. Transcribe incrementally (silent chunks mark a pause)
+                try:
+                    audio = await decode_speech(audio_bytes)
+                except Exception as exc:
+                    logger.warning("Undecodable audio from %s: %s", user.username, exc)
+                    continue
+                update = await stream.push(audio)
+
+                # Show newly agreed words right away, before translation
+                if update.partial is not None:
+                    await manager.broadcast_json(
+                        room_code,
+                        {
+                            "type": "partial_transcript",
+                            "message_id": update.partial["message_id"],
+                            "user_id": user.id,
+                            "username": user.username,
+                            "original_text": update.partial["text"],
+                            "source_language": update.partial["language"],
+                            "confidence": update.partial["confidence"],
+                        },
+                    )
+
+                for final in update.finals:
+                    await _process_utterance(room_code, participant, final)
 
             elif "text" in message:
                 # --- JSON control message ---
@@ -235,10 +267,9 @@ async def websocket_meeting(
                 msg_type = data.get("type", "")
 
                 if msg_type == "change_mode":
-                    new_mode = data.get("mode", language_mode)
+                    new_mode = data.get("mode", participant.language_mode)
                     if new_mode in ("hi_to_en", "en_to_hi"):
                         participant.language_mode = new_mode
-                        language_mode = new_mode
                         await manager.send_to_participant(
                             participant,
                             {
@@ -258,15 +289,15 @@ async def websocket_meeting(
     except Exception as exc:
         logger.exception("WS error for user=%s room=%s: %s", user.username, room_code, exc)
     finally:
-        manager.disconnect(room_code, participant)
-
-        # Notify others that user left
-        await manager.broadcast_json(
-            room_code,
-            {
-                "type": "user_left",
-                "user_id": user.id,
-                "username": user.username,
-                "participants": manager.get_participant_list(room_code),
-            },
-        )
+        # A socket replaced by the user's newer connection leaves silently
+        if manager.disconnect(room_code, participant):
+            # Notify others that user left
+            await manager.broadcast_json(
+                room_code,
+                {
+                    "type": "user_left",
+                    "user_id": user.id,
+                    "username": user.username,
+                    "participants": manager.get_participant_list(room_code),
+                },
+            )
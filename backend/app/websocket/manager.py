@@ -1,39 +1,55 @@
 """
 Connection manager for WebSocket meeting rooms.
 
-Maintains a mapping of room_code → set of active WebSocket connections.
+Maintains a mapping of room_code → {user_id: Participant} for active
+WebSocket connections.
 Handles broadcast, per-room messaging, and connection lifecycle.
 """
 
+import asyncio
 import logging
-from typing import Dict, Set
+from typing import Dict, Optional
 from dataclasses import dataclass, field
 
+import orjson
 from fastapi import WebSocket
 
+from app.services.streaming import StreamingBuffer
+
 logger = logging.getLogger(__name__)
 
+# A socket that can't take a message within this window is treated as dead
+# rather than stalling the rest of the room
+SEND_TIMEOUT_S = 0.5
+
+# Close code for a socket superseded by the same user's newer connection;
+# the client must not auto-reconnect on it
+CLOSE_REPLACED = 4009
+
 
-@dataclass
+@dataclass(eq=False)
 class Participant:
-    """Represents a connected meeting participant."""
+    """Represents a connected meeting participant (compared by identity)."""
     websocket: WebSocket
+    room_id: int
     user_id: int
     username: str
     language_mode: str  # "hi_to_en" or "en_to_hi"
+    stream: StreamingBuffer = field(default_factory=StreamingBuffer)
 
 
 class ConnectionManager:
     """Manages WebSocket connections grouped by room."""
 
     def __init__(self):
-        # room_code → set of Participant
-        self._rooms: Dict[str, Set[Participant]] = {}
+        # room_code → user_id → Participant
+        self._rooms: Dict[str, Dict[int, Participant]] = {}
 
     async def connect(
         self,
         websocket: WebSocket,
         room_code: str,
+        room_id: int,
         user_id: int,
         username: str,
         language_mode: str = "hi_to_en",
@@ -43,15 +59,19 @@ class ConnectionManager:
 
         participant = Participant(
             websocket=websocket,
+            room_id=room_id,
             user_id=user_id,
             username=username,
             language_mode=language_mode,
         )
 
-        if room_code not in self._rooms:
-            self._rooms[room_code] = set()
-
-        self._rooms[room_code].add(participant)
+        # A reconnecting user replaces their previous socket, which is closed
+        # so its handler stops feeding audio into the room
+        room = self._rooms.setdefault(room_code, {})
+        previous = room.get(user_id)
+        room[user_id] = participant
+        if previous is not None:
+            await self._close_one(previous, code=CLOSE_REPLACED)
 
         logger.info(
             "WS connected: user=%s room=%s mode=%s (total=%d)",
@@ -76,11 +96,18 @@ class ConnectionManager:
 
         return participant
 
-    def disconnect(self, room_code: str, participant: Participant):
-        """Remove a participant from a room."""
-        if room_code in self._rooms:
-            self._rooms[room_code].discard(participant)
-            if not self._rooms[room_code]:
+    def disconnect(self, room_code: str, participant: Participant) -> bool:
+        """
+        Remove a participant from a room.
+
+        Returns False if the socket had already been replaced by the same
+        user's newer connection (the user is still in the room).
+        """
+        removed = False
+        room = self._rooms.get(room_code)
+        if room is not None:
+            removed = self._remove(room, participant)
+            if not room:
                 del self._rooms[room_code]
 
         logger.info(
@@ -88,6 +115,27 @@ class ConnectionManager:
             participant.username,
             room_code,
         )
+        return removed
+
+    @staticmethod
+    def _remove(room: Dict[int, Participant], participant: Participant) -> bool:
+        # Only if this socket is still the user's current one
+        if room.get(participant.user_id) is participant:
+            del room[participant.user_id]
+            return True
+        return False
+
+    async def _send_one(
+        self, participant: Participant, text: str
+    ) -> Optional[Exception]:
+        """Send to one socket with a timeout; return the failure, if any."""
+        try:
+            await asyncio.wait_for(
+                participant.websocket.send_text(text), timeout=SEND_TIMEOUT_S
+            )
+        except Exception as exc:
+            return exc
+        return None
 
     async def broadcast_json(
         self,
@@ -95,26 +143,43 @@ class ConnectionManager:
         data: dict,
         exclude: Participant = None,
     ):
-        """Send JSON data to all participants in a room."""
+        """Send JSON data to all participants in a room concurrently."""
         if room_code not in self._rooms:
             return
 
-        disconnected = []
-        for p in self._rooms[room_code]:
-            if p is exclude:
-                continue
-            try:
-                await p.websocket.send_json(data)
-            except Exception:
-                disconnected.append(p)
+        # Encode once for the whole room rather than once per socket
+        text = orjson.dumps(data).decode()
+        recipients = [p for p in self._rooms[room_code].values() if p is not exclude]
+        results = await asyncio.gather(
+            *(self._send_one(p, text) for p in recipients)
+        )
 
-        for p in disconnected:
-            self._rooms[room_code].discard(p)
+        room = self._rooms.get(room_code)
+        dropped = []
+        for p, exc in zip(recipients, results):
+            if exc is not None:
+                logger.warning("Dropping %s from room %s: %r", p.username, room_code, exc)
+                if room is not None:
+                    self._remove(room, p)
+                dropped.append(p)
+        if dropped:
+            # Close the dropped sockets so their handlers see the disconnect
+            # and run their normal leave / cleanup path
+            await asyncio.gather(*(self._close_one(p) for p in dropped))
+
+    async def _close_one(self, participant: Participant, code: int = 1011):
+        """Close a dropped or replaced participant's socket, bounded like a send."""
+        try:
+            await asyncio.wait_for(
+                participant.websocket.close(code=code), timeout=SEND_TIMEOUT_S
+            )
+        except Exception:
+            pass
 
     async def send_to_participant(self, participant: Participant, data: dict):
         """Send JSON data to a specific participant."""
         try:
-            await participant.websocket.send_json(data)
+            await participant.websocket.send_text(orjson.dumps(data).decode())
         except Exception as exc:
             logger.warning("Failed to send to %s: %s", participant.username, exc)
 
@@ -129,7 +194,7 @@ class ConnectionManager:
                 "username": p.username,
                 "language_mode": p.language_mode,
             }
-            for p in self._rooms[room_code]
+            for p in self._rooms[room_code].values()
         ]
 
     def get_room_count(self) -> int:
@@ -3,7 +3,7 @@
  */
 
 import React, { createContext, useContext, useState, useEffect, useCallback } from 'react';
-import { getMe, clearToken, getToken } from '../services/api.js';
+import { getMe, clearToken, getToken, logout as apiLogout } from '../services/api.js';
 
 const AuthContext = createContext(null);
 
@@ -34,7 +34,8 @@ export function AuthProvider({ children }) {
     }, [fetchUser]);
 
     const logout = useCallback(() => {
-        clearToken();
+        // Revoke the token server-side; the local copy is cleared either way
+        apiLogout().catch(() => { });
         setUser(null);
     }, []);
 
@@ -7,6 +7,9 @@
 import { useRef, useState, useCallback, useEffect } from 'react';
 import { getToken } from '../services/api.js';
 
+// Server close code: this socket was replaced by a newer one for the same user
+const CLOSE_REPLACED = 4009;
+
 export function useWebSocket(roomCode) {
     const wsRef = useRef(null);
     const [status, setStatus] = useState('disconnected'); // connected | disconnected | connecting
@@ -15,6 +18,20 @@ export function useWebSocket(roomCode) {
     const reconnectTimer = useRef(null);
     const manualClose = useRef(false);
 
+    // Partial transcript, translation and audio arrive as separate events
+    // sharing one message_id; merge them into a single transcript entry.
+    const upsertMessage = useCallback((messageId, fields) => {
+        setMessages((prev) => {
+            const index = prev.findIndex((m) => m.id === messageId);
+            if (index === -1) {
+                return [...prev, { id: messageId, timestamp: new Date(), ...fields }];
+            }
+            const next = [...prev];
+            next[index] = { ...next[index], ...fields };
+            return next;
+        });
+    }, []);
+
     const connect = useCallback(() => {
         if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) return;
 
@@ -54,22 +71,31 @@ export function useWebSocket(roomCode) {
                         setParticipants(data.participants || []);
                         break;
 
+                    case 'partial_transcript':
+                        upsertMessage(data.message_id, {
+                            username: data.username,
+                            userId: data.user_id,
+                            originalText: data.original_text,
+                            translatedText: '',
+                            sourceLang: data.source_language,
+                            confidence: data.confidence,
+                        });
+                        break;
+
                     case 'translation_result':
-                        setMessages((prev) => [
-                            ...prev,
-                            {
-                                id: Date.now() + Math.random(),
-                                username: data.username,
-                                userId: data.user_id,
-                                originalText: data.original_text,
-                                translatedText: data.translated_text,
-                                sourceLang: data.source_language,
-                                targetLang: data.target_language,
-                                audioUrl: data.audio_url,
-                                confidence: data.confidence,
-                                timestamp: new Date(),
-                            },
-                        ]);
+                        upsertMessage(data.message_id, {
+                            username: data.username,
+                            userId: data.user_id,
+                            originalText: data.original_text,
+                            translatedText: data.translated_text,
+                            sourceLang: data.source_language,
+                            targetLang: data.target_language,
+                            confidence: data.confidence,
+                        });
+                        break;
+
+                    case 'audio_ready':
+                        upsertMessage(data.message_id, { audioUrl: data.audio_url });
                         break;
 
                     case 'mode_changed':
@@ -95,15 +121,16 @@ export function useWebSocket(roomCode) {
             setStatus('disconnected');
             console.log('[WS] Disconnected:', event.code, event.reason);
 
-            // Auto-reconnect unless manually closed
-            if (!manualClose.current) {
+            // Auto-reconnect unless manually closed or superseded by this
+            // user's newer connection (another tab), which would kick it back
+            if (!manualClose.current && event.code !== CLOSE_REPLACED) {
                 reconnectTimer.current = setTimeout(() => {
                     console.log('[WS] Reconnecting...');
                     connect();
                 }, 3000);
             }
         };
-    }, [roomCode]);
+    }, [roomCode, upsertMessage]);
 
     const disconnect = useCallback(() => {
         manualClose.current = true;
@@ -78,14 +78,18 @@ export default function MeetingPage() {
         }
     }, [messages]);
 
-    // Auto-play latest audio
+    // Auto-play each clip once, when its audio_ready event lands. Clips that
+    // arrive while auto-play is off are marked as seen, not queued.
+    const playedAudioIds = useRef(new Set());
     useEffect(() => {
-        if (!autoPlay || messages.length === 0) return;
-        const last = messages[messages.length - 1];
-        if (last.audioUrl) {
-            const audio = new Audio(last.audioUrl);
-            audio.volume = 0.8;
-            audio.play().catch(() => { });
+        for (const message of messages) {
+            if (!message.audioUrl || playedAudioIds.current.has(message.id)) continue;
+            playedAudioIds.current.add(message.id);
+            if (autoPlay) {
+                const audio = new Audio(message.audioUrl);
+                audio.volume = 0.8;
+                audio.play().catch(() => { });
+            }
         }
     }, [messages, autoPlay]);
 
@@ -57,6 +57,7 @@ async function apiFetch(endpoint, options = {}) {
         throw error;
     }
 
+    if (res.status === 204) return null;
     return res.json();
 }
 
@@ -81,6 +82,14 @@ export async function getMe() {
     return apiFetch('/auth/me');
 }
 
+export async function logout() {
+    try {
+        await apiFetch('/auth/logout', { method: 'POST' });
+    } finally {
+        clearToken();
+    }
+}
+
 // ---- Rooms ----
 export async function createRoom(name, maxParticipants = 10) {
     return apiFetch('/rooms/', {
@@ -14,6 +14,10 @@ export default defineConfig({
         target: 'ws://localhost:8000',
         ws: true,
       },
+      '/tts': {
+        target: 'http://localhost:8000',
+        changeOrigin: true,
+      },
       '/static': {
         target: 'http://localhost:8000',
         changeOrigin: true,